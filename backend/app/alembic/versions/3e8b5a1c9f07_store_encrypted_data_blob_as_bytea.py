@@ -0,0 +1,38 @@
+"""Store encrypted_data_blob as BYTEA
+
+Revision ID: 3e8b5a1c9f07
+Revises: 7c61f0a9d2e4
+Create Date: 2026-08-30 10:41:27.904412
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '3e8b5a1c9f07'
+down_revision = '7c61f0a9d2e4'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Rows that 7c61f0a9d2e4 could not re-encrypt are still Fernet tokens,
+    # which use the urlsafe base64 alphabet ('-'/'_'); translate those
+    # symbols first so decode() doesn't abort the upgrade on them. AES-GCM
+    # rows use the standard alphabet and pass through unchanged.
+    op.alter_column(
+        'secure_identities',
+        'encrypted_data_blob',
+        type_=sa.LargeBinary(),
+        postgresql_using="decode(translate(encrypted_data_blob, '-_', '+/'), 'base64')",
+    )
+
+
+def downgrade():
+    op.alter_column(
+        'secure_identities',
+        'encrypted_data_blob',
+        type_=sa.String(),
+        postgresql_using="encode(encrypted_data_blob, 'base64')",
+    )
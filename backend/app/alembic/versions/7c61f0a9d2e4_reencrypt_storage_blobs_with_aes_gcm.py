@@ -0,0 +1,82 @@
+"""Re-encrypt storage blobs with AES-GCM
+
+Revision ID: 7c61f0a9d2e4
+Revises: 4bb484424e1f
+Create Date: 2026-08-30 10:12:03.518274
+
+"""
+import base64
+import os
+
+import sqlalchemy as sa
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = '7c61f0a9d2e4'
+down_revision = '4bb484424e1f'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # One-shot data migration: rows written before the AES-GCM switch hold
+    # Fernet tokens; rewrite them as base64(nonce || ciphertext || tag).
+    # Without STORAGE_KEY in the environment the old key was ephemeral and
+    # the rows cannot be decrypted, so there is nothing to convert.
+    storage_key = os.getenv("STORAGE_KEY")
+    if not storage_key:
+        return
+
+    from cryptography.fernet import Fernet, InvalidToken
+    from cryptography.hazmat.primitives.ciphers.aead import AESGCM
+
+    fernet = Fernet(storage_key.encode())
+    aesgcm = AESGCM(base64.urlsafe_b64decode(storage_key.encode()))
+
+    conn = op.get_bind()
+    rows = conn.execute(
+        sa.text("SELECT id, encrypted_data_blob FROM secure_identities")
+    ).fetchall()
+    for row_id, blob in rows:
+        try:
+            plaintext = fernet.decrypt(blob.encode('utf-8'))
+        except InvalidToken:
+            # Already in the new format (or written under another key)
+            continue
+        nonce = os.urandom(12)
+        new_blob = base64.b64encode(
+            nonce + aesgcm.encrypt(nonce, plaintext, None)
+        ).decode('utf-8')
+        conn.execute(
+            sa.text(
+                "UPDATE secure_identities SET encrypted_data_blob = :blob WHERE id = :id"
+            ),
+            {"blob": new_blob, "id": row_id},
+        )
+
+
+def downgrade():
+    storage_key = os.getenv("STORAGE_KEY")
+    if not storage_key:
+        return
+
+    from cryptography.fernet import Fernet
+    from cryptography.hazmat.primitives.ciphers.aead import AESGCM
+
+    fernet = Fernet(storage_key.encode())
+    aesgcm = AESGCM(base64.urlsafe_b64decode(storage_key.encode()))
+
+    conn = op.get_bind()
+    rows = conn.execute(
+        sa.text("SELECT id, encrypted_data_blob FROM secure_identities")
+    ).fetchall()
+    for row_id, blob in rows:
+        raw = base64.b64decode(blob)
+        plaintext = aesgcm.decrypt(raw[:12], raw[12:], None)
+        conn.execute(
+            sa.text(
+                "UPDATE secure_identities SET encrypted_data_blob = :blob WHERE id = :id"
+            ),
+            {"blob": fernet.encrypt(plaintext).decode('utf-8'), "id": row_id},
+        )
@@ -0,0 +1,61 @@
+"""Recompute blind indexes with keyed BLAKE3
+
+Revision ID: b94d7e2f6a18
+Revises: 3e8b5a1c9f07
+Create Date: 2026-08-30 11:05:44.217690
+
+"""
+import base64
+import hashlib
+import os
+
+import sqlalchemy as sa
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = 'b94d7e2f6a18'
+down_revision = '3e8b5a1c9f07'
+branch_labels = None
+depends_on = None
+
+
+def _recompute(index_fn):
+    # Shared by upgrade/downgrade: decrypt each stored blob and rewrite
+    # its blind index with the given function. Needs both secrets from the
+    # environment; without them existing rows cannot be converted.
+    storage_key = os.getenv("STORAGE_KEY")
+    if not storage_key:
+        return
+
+    from cryptography.hazmat.primitives.ciphers.aead import AESGCM
+
+    aesgcm = AESGCM(base64.urlsafe_b64decode(storage_key.encode()))
+
+    conn = op.get_bind()
+    rows = conn.execute(
+        sa.text("SELECT id, encrypted_data_blob FROM secure_identities")
+    ).fetchall()
+    for row_id, blob in rows:
+        plaintext = aesgcm.decrypt(blob[:12], blob[12:], None)
+        conn.execute(
+            sa.text(
+                "UPDATE secure_identities SET blind_index_hash = :bi WHERE id = :id"
+            ),
+            {"bi": index_fn(plaintext), "id": row_id},
+        )
+
+
+def upgrade():
+    import blake3
+
+    secret = os.getenv("BLIND_INDEX_SECRET", "change-this-secret-to-something-long").encode()
+    key = hashlib.blake2b(secret, digest_size=32).digest()
+    _recompute(lambda pt: blake3.blake3(pt, key=key).hexdigest())
+
+
+def downgrade():
+    import hmac
+
+    secret = os.getenv("BLIND_INDEX_SECRET", "change-this-secret-to-something-long").encode()
+    _recompute(lambda pt: hmac.digest(secret, pt, 'sha256').hex())
@@ -1,5 +1,11 @@
+from datetime import datetime
+
 from fastapi import APIRouter, Depends, HTTPException, status
-from sqlmodel import Session, select, func
+from fastapi.responses import ORJSONResponse
+from sqlalchemy import bindparam
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlmodel import select, func
+from sqlmodel.ext.asyncio.session import AsyncSession
 
 # Project Imports
 from app.api import deps
@@ -9,26 +15,39 @@ from app.schemas import ekyc as schemas
 
 router = APIRouter()
 
+# Built once at module scope so SQLAlchemy compiles it a single time;
+# with prepare_threshold=1 on the engine, Postgres also reuses the
+# server-side plan across requests.
+_BLIND_LOOKUP_STMT = select(SecureIdentity.id).where(
+    SecureIdentity.blind_index_hash == bindparam("bi")
+)
+
 # --- 1. Public Key Endpoint ---
 # Frontend URL: /api/v1/public-key
 @router.get("/public-key")
-def get_public_key():
+async def get_public_key():
     """
     Frontend calls this to initialize the SecureBridge.
+    Also exposes the X25519 key for clients supporting the ECDH wrap path.
     """
-    return {"public_key": security_ekyc.get_rsa_public_key()} 
+    return {
+        "public_key": security_ekyc.get_rsa_public_key(),
+        "x25519_public_key": security_ekyc.get_x25519_public_key(),
+    }
 
 
 # --- 2. Create Identity Endpoint ---
 # Frontend URL: /api/v1/secure-identities
 @router.post("/secure-identities", response_model=schemas.SecureIdentityResponse, status_code=status.HTTP_201_CREATED)
-def create_secure_identity(
-    payload: schemas.SecureIdentityCreateRequest, 
-    db: Session = Depends(deps.get_db)
+async def create_secure_identity(
+    payload: schemas.SecureIdentityCreateRequest,
+    db: AsyncSession = Depends(deps.get_async_db)
 ):
     try:
         # 1. Decrypt (Hybrid Decryption)
-        national_id_str = security_ekyc.decrypt_ingress_payload(
+        # RSA unwraps run in a process pool so concurrent requests use all
+        # cores instead of serializing on the GIL.
+        national_id_str = await security_ekyc.decrypt_ingress_payload_async(
             encrypted_aes_key=payload.encrypted_key,
             iv=payload.iv,
             ciphertext=payload.encrypted_data,
@@ -41,31 +60,38 @@ def create_secure_identity(
         # 2. Generate Blind Index
         blind_idx = security_ekyc.generate_blind_index(national_id_str)
 
-        # 3. Check Duplicates
-        statement = select(SecureIdentity).where(SecureIdentity.blind_index_hash == blind_idx)
-        existing = db.exec(statement).first()
-        
-        if existing:
-             raise HTTPException(status_code=409, detail=f"Identity already exists (ID: {existing.id})")
-
-        # 4. Encrypt for Storage
+        # 3. Encrypt for Storage
         storage_blob = security_ekyc.encrypt_for_db(national_id_str)
 
-        # 5. Save to Database
-        new_identity = SecureIdentity(
-            full_name=payload.full_name,
-            encrypted_data_blob=storage_blob,
-            blind_index_hash=blind_idx
+        # 4. Insert atomically: ON CONFLICT on the unique blind index does
+        # the duplicate check and the insert in one round trip, with no
+        # race window between check and insert.
+        stmt = (
+            pg_insert(SecureIdentity)
+            .values(
+                full_name=payload.full_name,
+                encrypted_data_blob=storage_blob,
+                blind_index_hash=blind_idx,
+                created_at=datetime.now(),
+            )
+            .on_conflict_do_nothing(index_elements=["blind_index_hash"])
+            .returning(SecureIdentity.id, SecureIdentity.created_at)
         )
-        db.add(new_identity)
-        db.commit()
-        db.refresh(new_identity)
+        inserted = (await db.exec(stmt)).first()
+        await db.commit()
+
+        if inserted is None:
+            # Conflict path: fetch the existing row id for the 409 detail
+            existing_id = (await db.exec(
+                _BLIND_LOOKUP_STMT, params={"bi": blind_idx}
+            )).first()
+            raise HTTPException(status_code=409, detail=f"Identity already exists (ID: {existing_id})")
 
         return schemas.SecureIdentityResponse(
-            id=new_identity.id,
-            full_name=new_identity.full_name,
-            blind_index=new_identity.blind_index_hash, 
-            created_at=new_identity.created_at
+            id=inserted.id,
+            full_name=payload.full_name,
+            blind_index=blind_idx,
+            created_at=inserted.created_at
         )
 
     except HTTPException as he:
@@ -77,29 +103,58 @@ def create_secure_identity(
 
 # --- 3. Read Identities Endpoint ---
 # Frontend URL: /api/v1/secure-identities
-@router.get("/secure-identities", response_model=schemas.SecureIdentitiesPublic)
-def read_secure_identities(
-    skip: int = 0, 
-    limit: int = 100, 
-    db: Session = Depends(deps.get_db)
+@router.get("/secure-identities", response_class=ORJSONResponse)
+async def read_secure_identities(
+    skip: int = 0,
+    limit: int = 100,
+    after_id: int | None = None,
+    include_total: bool = True,
+    db: AsyncSession = Depends(deps.get_async_db)
 ):
-    # 1. Get total count
-    count_statement = select(func.count()).select_from(SecureIdentity)
-    count = db.exec(count_statement).one()
-
-    # 2. Get Data Page
-    statement = select(SecureIdentity).offset(skip).limit(limit)
-    identities_db = db.exec(statement).all()
-
-    # 3. Map to Response Models
+    # Keyset pages imply no total: the window count would run after the
+    # cursor filter and silently change meaning from "total rows" to
+    # "rows after the cursor" as the client pages.
+    if after_id is not None:
+        include_total = False
+
+    # 1. Get Data Page (+ total in the same query when requested: the
+    # COUNT(*) OVER () window piggybacks on the page scan). Selecting the
+    # bare columns skips ORM row hydration entirely.
+    columns = [
+        SecureIdentity.id,
+        SecureIdentity.full_name,
+        SecureIdentity.blind_index_hash,
+        SecureIdentity.created_at,
+    ]
+    if include_total:
+        columns.append(func.count().over().label("total"))
+    statement = select(*columns).order_by(SecureIdentity.id)
+
+    if after_id is not None:
+        # Keyset pagination: a bounded index range scan, O(limit) at any
+        # depth, unlike OFFSET which scans and discards `skip` rows.
+        statement = statement.where(SecureIdentity.id > after_id)
+    else:
+        statement = statement.offset(skip)
+    statement = statement.limit(limit)
+
+    rows = (await db.exec(statement)).all()
+    count = (rows[0].total if rows else 0) if include_total else None
+
+    # 2. Serialize straight to JSON (shape matches SecureIdentitiesPublic);
+    # orjson handles datetime natively and skips the response-model
+    # re-validation pass.
     results = [
-        schemas.SecureIdentityResponse(
-            id=item.id,
-            full_name=item.full_name,
-            blind_index=item.blind_index_hash, 
-            created_at=item.created_at
-        )
-        for item in identities_db
+        {
+            "id": row.id,
+            "full_name": row.full_name,
+            "blind_index": row.blind_index_hash,
+            "created_at": row.created_at,
+        }
+        for row in rows
     ]
 
-    return {"data": results, "count": count}
\ No newline at end of file
+    # Cursor for the next keyset page; None once the last page is reached
+    next_cursor = rows[-1].id if len(rows) == limit else None
+
+    return ORJSONResponse({"data": results, "count": count, "next_cursor": next_cursor})
\ No newline at end of file
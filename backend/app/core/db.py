@@ -1,10 +1,27 @@
+from sqlalchemy.ext.asyncio import create_async_engine
 from sqlmodel import Session, create_engine, select
 
 from app import crud
 from app.core.config import settings
 from app.models import User, UserCreate
 
-engine = create_engine(str(settings.SQLALCHEMY_DATABASE_URI))
+# Pool sizing amortizes the Postgres connection handshake across requests;
+# pre_ping drops stale connections instead of surfacing them as errors, and
+# prepare_threshold=1 lets psycopg promote hot statements (blind-index
+# lookup, identity insert) to server-side prepared plans after first reuse.
+_ENGINE_KWARGS: dict = {
+    "pool_size": 20,
+    "max_overflow": 10,
+    "pool_pre_ping": True,
+    "pool_recycle": 1800,
+    "connect_args": {"prepare_threshold": 1},
+}
+
+engine = create_engine(str(settings.SQLALCHEMY_DATABASE_URI), **_ENGINE_KWARGS)
+
+# Async engine for async endpoints; psycopg (v3) serves both sync and
+# async connections from the same URL.
+async_engine = create_async_engine(str(settings.SQLALCHEMY_DATABASE_URI), **_ENGINE_KWARGS)
 
 
 # make sure all SQLModel models are imported (app.models) before initializing DB
@@ -129,6 +129,6 @@ class SecureIdentity(SQLModel, table=True):
     id: Optional[int] = Field(default=None, primary_key=True)
     full_name: str
     blind_index_hash: str = Field(index=True, unique=True)
-    encrypted_data_blob: str
+    encrypted_data_blob: bytes
     created_at: datetime = Field(default_factory=datetime.now)
     
\ No newline at end of file
@@ -1,4 +1,4 @@
-from typing import List, Optional, Any
+from typing import List, Optional
 from pydantic import BaseModel
 from datetime import datetime
 
@@ -33,7 +33,12 @@ class SecureIdentityResponse(BaseModel):
 class SecureIdentitiesPublic(BaseModel):
     """
     The wrapper structure expected by React Query / TanStack Table.
-    { data: [...], count: 10 }
+    { data: [...], count: 10, next_cursor: 42 }
+    count is always the full table total; it is None when the caller opts
+    out via ?include_total=false or pages with ?after_id=... (keyset
+    requests never carry a total, so its meaning can't drift mid-paging).
+    next_cursor feeds the next ?after_id.
     """
     data: List[SecureIdentityResponse]
-    count: int
\ No newline at end of file
+    count: Optional[int] = None
+    next_cursor: Optional[int] = None
\ No newline at end of file
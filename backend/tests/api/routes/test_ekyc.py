@@ -0,0 +1,95 @@
+from fastapi.testclient import TestClient
+
+from app.core.config import settings
+from tests.utils.ekyc import encrypt_ingress_payload
+from tests.utils.utils import random_lower_string
+
+
+def _create_identity(client: TestClient, national_id: str) -> dict:
+    response = client.post(
+        f"{settings.API_V1_STR}/secure-identities",
+        json=encrypt_ingress_payload(national_id),
+    )
+    assert response.status_code == 201
+    return response.json()
+
+
+def test_get_public_key(client: TestClient) -> None:
+    response = client.get(f"{settings.API_V1_STR}/public-key")
+    assert response.status_code == 200
+    content = response.json()
+    assert content["public_key"].startswith("-----BEGIN PUBLIC KEY-----")
+    assert content["x25519_public_key"]
+
+
+def test_create_secure_identity(client: TestClient) -> None:
+    payload = encrypt_ingress_payload(random_lower_string())
+    response = client.post(
+        f"{settings.API_V1_STR}/secure-identities", json=payload
+    )
+    assert response.status_code == 201
+    content = response.json()
+    assert content["full_name"] == payload["full_name"]
+    assert "id" in content
+    assert "blind_index" in content
+    assert "created_at" in content
+
+
+def test_create_secure_identity_duplicate_conflict(client: TestClient) -> None:
+    national_id = random_lower_string()
+    created = _create_identity(client, national_id)
+    # Same national ID re-encrypted under a fresh key still collides on
+    # the blind index
+    response = client.post(
+        f"{settings.API_V1_STR}/secure-identities",
+        json=encrypt_ingress_payload(national_id),
+    )
+    assert response.status_code == 409
+    assert str(created["id"]) in response.json()["detail"]
+
+
+def test_read_secure_identities(client: TestClient) -> None:
+    for _ in range(2):
+        _create_identity(client, random_lower_string())
+    response = client.get(f"{settings.API_V1_STR}/secure-identities")
+    assert response.status_code == 200
+    content = response.json()
+    assert content["count"] >= 2
+    assert len(content["data"]) >= 2
+    item = content["data"][0]
+    assert "id" in item
+    assert "full_name" in item
+    assert "blind_index" in item
+
+
+def test_read_secure_identities_without_total(client: TestClient) -> None:
+    _create_identity(client, random_lower_string())
+    response = client.get(
+        f"{settings.API_V1_STR}/secure-identities",
+        params={"include_total": "false"},
+    )
+    assert response.status_code == 200
+    content = response.json()
+    assert content["count"] is None
+    assert len(content["data"]) >= 1
+
+
+def test_read_secure_identities_keyset(client: TestClient) -> None:
+    for _ in range(3):
+        _create_identity(client, random_lower_string())
+    first_page = client.get(
+        f"{settings.API_V1_STR}/secure-identities", params={"limit": 2}
+    ).json()
+    assert len(first_page["data"]) == 2
+    assert first_page["next_cursor"] == first_page["data"][-1]["id"]
+
+    second_page = client.get(
+        f"{settings.API_V1_STR}/secure-identities",
+        params={"limit": 2, "after_id": first_page["next_cursor"]},
+    ).json()
+    # Keyset pages never carry a total and never repeat rows
+    assert second_page["count"] is None
+    first_ids = {item["id"] for item in first_page["data"]}
+    for item in second_page["data"]:
+        assert item["id"] > first_page["next_cursor"]
+        assert item["id"] not in first_ids
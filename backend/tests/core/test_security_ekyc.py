@@ -0,0 +1,86 @@
+import asyncio
+import hashlib
+
+import blake3
+
+from app.core import security_ekyc
+from tests.utils.ekyc import encrypt_ingress_payload, encrypt_ingress_payload_x25519
+from tests.utils.utils import random_lower_string
+
+
+def test_decrypt_ingress_payload_rsa_round_trip() -> None:
+    national_id = random_lower_string()
+    payload = encrypt_ingress_payload(national_id)
+    decrypted = security_ekyc.decrypt_ingress_payload(
+        encrypted_aes_key=payload["encrypted_key"],
+        iv=payload["iv"],
+        ciphertext=payload["encrypted_data"],
+        auth_tag=payload["auth_tag"],
+    )
+    assert decrypted == national_id
+
+
+def test_decrypt_ingress_payload_x25519_round_trip() -> None:
+    national_id = random_lower_string()
+    payload = encrypt_ingress_payload_x25519(national_id)
+    decrypted = security_ekyc.decrypt_ingress_payload(
+        encrypted_aes_key=payload["encrypted_key"],
+        iv=payload["iv"],
+        ciphertext=payload["encrypted_data"],
+        auth_tag=payload["auth_tag"],
+    )
+    assert decrypted == national_id
+
+
+def test_decrypt_ingress_payload_async_round_trip() -> None:
+    national_id = random_lower_string()
+    payload = encrypt_ingress_payload(national_id)
+    decrypted = asyncio.run(
+        security_ekyc.decrypt_ingress_payload_async(
+            encrypted_aes_key=payload["encrypted_key"],
+            iv=payload["iv"],
+            ciphertext=payload["encrypted_data"],
+            auth_tag=payload["auth_tag"],
+        )
+    )
+    assert decrypted == national_id
+
+
+def test_decrypt_ingress_payload_rejects_tampered_tag() -> None:
+    payload = encrypt_ingress_payload(random_lower_string())
+    tampered = "A" * len(payload["auth_tag"] or "AAAA")
+    decrypted = security_ekyc.decrypt_ingress_payload(
+        encrypted_aes_key=payload["encrypted_key"],
+        iv=payload["iv"],
+        ciphertext=payload["encrypted_data"],
+        auth_tag=tampered,
+    )
+    assert decrypted is None
+
+
+def test_storage_encryption_round_trip() -> None:
+    plaintext = random_lower_string()
+    blob = security_ekyc.encrypt_for_db(plaintext)
+    assert isinstance(blob, bytes)
+    # nonce (12) + ciphertext + GCM tag (16)
+    assert len(blob) == 12 + len(plaintext.encode("utf-8")) + 16
+    assert security_ekyc.decrypt_from_db(blob) == plaintext
+
+
+def test_storage_encryption_is_randomized() -> None:
+    plaintext = random_lower_string()
+    assert security_ekyc.encrypt_for_db(plaintext) != security_ekyc.encrypt_for_db(plaintext)
+
+
+def test_generate_blind_index_is_deterministic() -> None:
+    value = random_lower_string()
+    assert security_ekyc.generate_blind_index(value) == security_ekyc.generate_blind_index(value)
+
+
+def test_generate_blind_index_matches_keyed_blake3() -> None:
+    # Must stay in lockstep with the recompute formula used by migration
+    # b94d7e2f6a18, or a migrated table stops matching fresh indexes.
+    value = random_lower_string()
+    key = hashlib.blake2b(security_ekyc.BLIND_INDEX_SECRET, digest_size=32).digest()
+    expected = blake3.blake3(value.encode("utf-8"), key=key).hexdigest()
+    assert security_ekyc.generate_blind_index(value) == expected
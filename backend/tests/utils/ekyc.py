@@ -0,0 +1,72 @@
+import base64
+import os
+
+from cryptography.hazmat.primitives import hashes, serialization
+from cryptography.hazmat.primitives.asymmetric import padding as asym_padding
+from cryptography.hazmat.primitives.asymmetric.x25519 import (
+    X25519PrivateKey,
+    X25519PublicKey,
+)
+from cryptography.hazmat.primitives.ciphers.aead import AESGCM
+from cryptography.hazmat.primitives.kdf.hkdf import HKDF
+
+from app.core import security_ekyc
+
+
+def _b64(data: bytes) -> str:
+    return base64.b64encode(data).decode("utf-8")
+
+
+def _seal(symmetric_key: bytes, national_id: str) -> tuple[bytes, bytes, bytes]:
+    iv = os.urandom(12)
+    sealed = AESGCM(symmetric_key).encrypt(iv, national_id.encode("utf-8"), None)
+    return iv, sealed[:-16], sealed[-16:]
+
+
+def encrypt_ingress_payload(national_id: str, full_name: str = "Test User") -> dict[str, str]:
+    """
+    Builds the hybrid payload the SecureBridge frontend would send,
+    wrapping a fresh AES key with the server's RSA public key.
+    """
+    symmetric_key = os.urandom(32)
+    public_key = serialization.load_pem_public_key(
+        security_ekyc.get_rsa_public_key().encode("utf-8")
+    )
+    encrypted_key = public_key.encrypt(
+        symmetric_key,
+        asym_padding.OAEP(
+            mgf=asym_padding.MGF1(algorithm=hashes.SHA256()),
+            algorithm=hashes.SHA256(),
+            label=None,
+        ),
+    )
+    iv, ciphertext, auth_tag = _seal(symmetric_key, national_id)
+    return {
+        "full_name": full_name,
+        "encrypted_data": _b64(ciphertext),
+        "encrypted_key": _b64(encrypted_key),
+        "iv": _b64(iv),
+        "auth_tag": _b64(auth_tag),
+    }
+
+
+def encrypt_ingress_payload_x25519(national_id: str, full_name: str = "Test User") -> dict[str, str]:
+    """
+    Same payload via the ECDH wrap path: an ephemeral X25519 public key
+    stands in for the wrapped AES key.
+    """
+    ephemeral = X25519PrivateKey.generate()
+    server_public = X25519PublicKey.from_public_bytes(
+        base64.b64decode(security_ekyc.get_x25519_public_key())
+    )
+    symmetric_key = HKDF(
+        algorithm=hashes.SHA256(), length=32, salt=None, info=b"ekyc-v1"
+    ).derive(ephemeral.exchange(server_public))
+    iv, ciphertext, auth_tag = _seal(symmetric_key, national_id)
+    return {
+        "full_name": full_name,
+        "encrypted_data": _b64(ciphertext),
+        "encrypted_key": _b64(ephemeral.public_key().public_bytes_raw()),
+        "iv": _b64(iv),
+        "auth_tag": _b64(auth_tag),
+    }